@@ -0,0 +1,356 @@
+"""
+Camada Bronze - extracao dos arquivos JSON de origem para Parquet.
+
+Le os 10 arquivos JSON brutos de data/raw, converte cada um diretamente em
+tabela Arrow e grava o resultado em data/bronze como Parquet, sem aplicar
+transformacao de negocio (isso e responsabilidade da camada Silver).
+"""
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# jemalloc mantem arenas por thread e evita thrash de sbrk/mmap nas
+# alocacoes grandes (>GB) dos buffers temporarios de cada arquivo JSON.
+# Wheels Linux do pyarrow vem com ARROW_JEMALLOC=ON; em builds sem ele,
+# fica o pool padrao.
+try:
+    pa.set_memory_pool(pa.jemalloc_memory_pool())
+except (ImportError, NotImplementedError):
+    pass
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+RAW_DIR = BASE_DIR / "data" / "raw"
+BRONZE_DIR = BASE_DIR / "data" / "bronze"
+
+# entidade -> arquivo JSON de origem
+SOURCES = {
+    "customers": "customers_master.json",
+    "transactions": "payment_transactions.json",
+    "reviews_jan": "customer_reviews_jan.json",
+    "reviews_feb": "customer_reviews_feb.json",
+    "inventory_jan": "inventory_adjustments_jan.json",
+    "inventory_feb": "inventory_adjustments_feb.json",
+    "tickets": "support_tickets.json",
+    "products": "products_catalog.json",
+    "campaigns": "marketing_campaigns.json",
+    "shipping": "shipping_logs.json",
+}
+
+_REVIEWS_SCHEMA = pa.schema(
+    [
+        ("review_id", pa.string()),
+        ("transaction_id", pa.string()),
+        ("rating", pa.int64()),
+        ("review_date", pa.string()),
+        ("review_text", pa.string()),
+    ]
+)
+
+_INVENTORY_SCHEMA = pa.schema(
+    [
+        ("adjustment_id", pa.string()),
+        ("product_id", pa.string()),
+        ("quantity", pa.int64()),
+        ("reason", pa.string()),
+        ("adjusted_at", pa.string()),
+    ]
+)
+
+# Schemas estaveis das 10 entidades: declara-los na escrita evita que o
+# Arrow escaneie todos os valores para inferir tipos a cada execucao
+# (datas e valores monetarios chegam como string do JSON e so viram tipos
+# nativos na Silver).
+SCHEMAS = {
+    "customers": pa.schema(
+        [
+            ("customer_id", pa.string()),
+            ("name", pa.string()),
+            ("email", pa.string()),
+            ("phone", pa.string()),
+            ("address", pa.string()),
+            ("birth_date", pa.string()),
+            ("created_at", pa.string()),
+            ("status", pa.string()),
+        ]
+    ),
+    "transactions": pa.schema(
+        [
+            ("transaction_id", pa.string()),
+            ("order_id", pa.string()),
+            ("customer_id", pa.string()),
+            ("amount", pa.string()),
+            ("currency", pa.string()),
+            ("payment_date", pa.string()),
+            ("status", pa.string()),
+            ("payment_method", pa.string()),
+        ]
+    ),
+    "reviews_jan": _REVIEWS_SCHEMA,
+    "reviews_feb": _REVIEWS_SCHEMA,
+    "inventory_jan": _INVENTORY_SCHEMA,
+    "inventory_feb": _INVENTORY_SCHEMA,
+    "tickets": pa.schema(
+        [
+            ("ticket_id", pa.string()),
+            ("customer_id", pa.string()),
+            ("subject", pa.string()),
+            ("status", pa.string()),
+            ("created_at", pa.string()),
+            ("resolved_at", pa.string()),
+        ]
+    ),
+    "products": pa.schema(
+        [
+            ("product_id", pa.string()),
+            ("name", pa.string()),
+            ("category", pa.string()),
+            ("price", pa.float64()),
+            ("stock", pa.int64()),
+        ]
+    ),
+    "campaigns": pa.schema(
+        [
+            ("campaign_id", pa.string()),
+            ("name", pa.string()),
+            ("channel", pa.string()),
+            ("start_date", pa.string()),
+            ("end_date", pa.string()),
+            ("budget", pa.float64()),
+        ]
+    ),
+    "shipping": pa.schema(
+        [
+            ("shipment_id", pa.string()),
+            ("order_id", pa.string()),
+            ("carrier", pa.string()),
+            ("shipped_at", pa.string()),
+            ("delivered_at", pa.string()),
+            ("status", pa.string()),
+        ]
+    ),
+}
+
+if orjson is not None:
+    _DECODE_ERRORS = (json.JSONDecodeError, ValueError, orjson.JSONDecodeError)
+else:
+    _DECODE_ERRORS = (json.JSONDecodeError, ValueError)
+
+# Parser unico reutilizado entre os 10 arquivos para amortizar a alocacao
+# interna de tape do simdjson.
+_parser = simdjson.Parser() if simdjson is not None else None
+
+
+def _parse_records(raw):
+    """Converte um buffer JSON (lista de registros) em lista de dicts.
+
+    Aceita bytes ou qualquer buffer (ex.: mmap). Ordem de preferencia:
+    pysimdjson (parse SIMD a 2-3 GB/s), orjson, json da stdlib.
+    """
+    if _parser is not None:
+        # A API de objetos do simdjson difere de dict; materializamos via
+        # as_list() apenas no final, apos o parse zero-copy.
+        return _parser.parse(raw).as_list()
+    if orjson is not None:
+        # orjson aceita bytes/memoryview mas nao mmap; memoryview embrulha
+        # o buffer sem copiar
+        return orjson.loads(memoryview(raw))
+    return json.loads(bytes(raw))
+
+
+def _parse_to_table(raw, schema):
+    """Parseia um buffer JSON direto para pa.Table.
+
+    Com schema declarado, so os campos do schema sao materializados: no
+    caminho simdjson os registros sao percorridos de forma lazy e os campos
+    descartados nunca viram objetos Python (dict + str por registro); nos
+    fallbacks a projecao acontece logo apos o parse. Sem schema, cai na
+    inferencia padrao do Arrow sobre a lista de dicts.
+    """
+    if schema is None:
+        return pa.Table.from_pylist(_parse_records(raw))
+
+    names = schema.names
+    columns = {name: [] for name in names}
+    if _parser is not None:
+        for record in _parser.parse(raw):
+            for name in names:
+                try:
+                    columns[name].append(record[name])
+                except KeyError:
+                    columns[name].append(None)
+    else:
+        # mesmo embrulho de memoryview de _parse_records: orjson nao
+        # aceita o mmap cru
+        data = (
+            orjson.loads(memoryview(raw))
+            if orjson is not None
+            else json.loads(bytes(raw))
+        )
+        for name in names:
+            columns[name] = [record.get(name) for record in data]
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def extract_json_to_table(filepath, entity_name=None):
+    """Le um arquivo JSON (lista de registros) e devolve uma pa.Table.
+
+    Usa pysimdjson (ou orjson) quando disponivel, ordens de grandeza mais
+    rapido que o json da stdlib no parse dos arquivos grandes da Bronze.
+    Construir Arrow direto (sem DataFrame intermediario) evita a
+    consolidacao de blocos do pandas e o round-trip por arrays de objetos
+    NumPy, cortando o pico de memoria pela metade. Quando a entidade tem
+    schema declarado em SCHEMAS, a inferencia de tipos e pulada.
+    Devolve None se o arquivo nao existir ou for invalido.
+    """
+    filepath = Path(filepath)
+    if not filepath.exists():
+        logger.error("Arquivo nao encontrado: %s", filepath)
+        return None
+
+    try:
+        # mmap evita a copia do read() para userspace: o parser consome as
+        # paginas direto do page cache. O buffer precisa ficar vivo ate o
+        # fim do parse, por isso a materializacao acontece dentro do with.
+        with open(filepath, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                table = _parse_to_table(mm, SCHEMAS.get(entity_name))
+    except _DECODE_ERRORS as exc:
+        logger.error("JSON invalido em %s: %s", filepath.name, exc)
+        return None
+
+    logger.info("%s: %d registros, colunas %s", filepath.name, table.num_rows, table.column_names)
+    return table
+
+
+def save_to_bronze(table, entity_name):
+    """Grava a tabela Arrow da entidade em data/bronze como Parquet.
+
+    ZSTD nivel 3 com dictionary encoding: para dados tabulares vindos de
+    JSON, cheios de strings repetidas (ids, emails, colunas de status),
+    o dicionario colapsa os valores em codigos int32 e o ZSTD comprime
+    ~2x melhor que o snappy padrao com velocidade de escrita parecida.
+    """
+    BRONZE_DIR.mkdir(parents=True, exist_ok=True)
+    filename = BRONZE_DIR / f"{entity_name}.parquet"
+    pq.write_table(
+        table,
+        filename,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+    )
+    logger.info("Bronze gravado: %s (%d registros)", filename.name, table.num_rows)
+    return filename
+
+
+def parse_and_save(entity_name, raw):
+    """Faz o parse de um buffer JSON ja lido e grava a Bronze.
+
+    Roda dentro de um worker do ProcessPoolExecutor, entao nao pode
+    depender de estado mutavel do processo pai.
+    """
+    try:
+        table = _parse_to_table(raw, SCHEMAS.get(entity_name))
+    except _DECODE_ERRORS as exc:
+        logger.error("JSON invalido em %s: %s", entity_name, exc)
+        return {"entity": entity_name, "records": 0, "columns": 0, "status": "Falhou"}
+
+    save_to_bronze(table, entity_name)
+    return {
+        "entity": entity_name,
+        "records": table.num_rows,
+        "columns": table.num_columns,
+        "status": "Sucesso",
+    }
+
+
+async def _extract_source(loop, executor, entity_name, json_file):
+    """Le o arquivo sem bloquear o event loop e parseia no pool."""
+    filepath = RAW_DIR / json_file
+    if not filepath.exists():
+        return {"entity": entity_name, "records": 0, "columns": 0, "status": "Não encontrado"}
+
+    if aiofiles is not None:
+        async with aiofiles.open(filepath, "rb") as f:
+            raw = await f.read()
+    else:
+        raw = await loop.run_in_executor(None, filepath.read_bytes)
+
+    return await loop.run_in_executor(executor, parse_and_save, entity_name, raw)
+
+
+async def _extract_all_async():
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=min(len(SOURCES), os.cpu_count())) as executor:
+        return list(
+            await asyncio.gather(
+                *(
+                    _extract_source(loop, executor, entity_name, json_file)
+                    for entity_name, json_file in SOURCES.items()
+                )
+            )
+        )
+
+
+def extract_all_sources():
+    """Extrai todas as fontes JSON e grava a camada Bronze.
+
+    A leitura dos 10 arquivos acontece via aiofiles enquanto os workers do
+    ProcessPoolExecutor parseiam os buffers ja lidos: enquanto um processo
+    parseia o arquivo N, o event loop ja esta emitindo a leitura do N+1,
+    sobrepondo as ~9 esperas de I/O com CPU.
+
+    Devolve a lista-resumo com entidade, contagem de registros, numero de
+    colunas e status de cada extracao.
+    """
+    logger.info("Iniciando extracao da camada Bronze")
+    extraction_summary = asyncio.run(_extract_all_async())
+
+    # Formatar o resumo de 10 linhas direto da lista de dicts: montar um
+    # DataFrame so para imprimir (e rodar regex em 10 status) e overhead
+    # de import/alocacao sem retorno.
+    logger.info(
+        "Resumo da extracao:\n"
+        + "\n".join(
+            f"{s['entity']:<16} {s['records']:>8} {s['columns']:>4} {s['status']}"
+            for s in extraction_summary
+        )
+    )
+
+    failed = sum(1 for s in extraction_summary if s["status"] in {"Falhou", "Não encontrado"})
+    success = len(extraction_summary) - failed
+    logger.info("Extracao concluida: %d sucesso(s), %d falha(s)", success, failed)
+    return extraction_summary
+
+
+if __name__ == "__main__":
+    extract_all_sources()
@@ -0,0 +1,180 @@
+"""
+Camada Silver em Polars lazy - alternativa streaming a transformations.py.
+
+Mesmas regras de negocio da versao pandas, expressas como LazyFrames:
+transformacao, validacao e escrita compilam num unico plano de consulta
+com pushdown de projecao/predicado, materializado so no sink final. Util
+quando os dados nao cabem confortavelmente em memoria; a versao pandas
+continua sendo o caminho canonico do pipeline.
+"""
+
+import logging
+from pathlib import Path
+
+import polars as pl
+
+from transformations import EMAIL_PATTERN
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+BRONZE_DIR = BASE_DIR / "data" / "bronze"
+SILVER_DIR = BASE_DIR / "data" / "silver"
+
+_TEXT_NULLS = ["", "nan", "null", "none"]
+
+
+def scan_bronze(entity_name, columns=None):
+    """Plano lazy sobre o Parquet da entidade; a projecao vira pushdown."""
+    lf = pl.scan_parquet(BRONZE_DIR / f"{entity_name}.parquet")
+    if columns is not None:
+        lf = lf.select(columns)
+    return lf
+
+
+def _clean_text_columns(lf):
+    """Strip + sentinelas nulas em todas as colunas de texto do plano.
+
+    A comparacao e feita sobre o valor em minusculas, espelhando o
+    _clean_text_series do pandas - "NULL"/"NaN" tambem viram nulo.
+    """
+    stripped = pl.col(pl.String).str.strip_chars()
+    return lf.with_columns(
+        pl.when(stripped.str.to_lowercase().is_in(_TEXT_NULLS))
+        .then(None)
+        .otherwise(stripped)
+        .name.keep()
+    )
+
+
+def transform_customers_lazy():
+    """Plano lazy de customers com as mesmas regras da versao pandas."""
+    lf = scan_bronze(
+        "customers",
+        columns=["customer_id", "name", "email", "phone", "address",
+                 "birth_date", "created_at", "status"],
+    )
+    lf = lf.with_columns(
+        pl.col("created_at").str.to_datetime(strict=False),
+        pl.col("birth_date").str.to_datetime(strict=False),
+        pl.col("email").str.to_lowercase().str.strip_chars(),
+    )
+    lf = lf.filter(
+        pl.col("customer_id").is_not_null()
+        & pl.col("email").str.contains("@")
+        & (pl.col("email") != "")
+        & pl.col("email").str.contains(EMAIL_PATTERN)
+    )
+    lf = lf.unique(subset=["customer_id"], keep="first", maintain_order=True)
+    return _clean_text_columns(lf)
+
+
+def transform_orders_lazy(customers_lf):
+    """Plano lazy de orders (reviews + transactions + email do cliente)."""
+    review_columns = ["transaction_id", "rating", "review_date"]
+    reviews = pl.concat(
+        [
+            scan_bronze("reviews_jan", columns=review_columns),
+            scan_bronze("reviews_feb", columns=review_columns),
+        ]
+    )
+    transactions = scan_bronze(
+        "transactions",
+        columns=["transaction_id", "order_id", "customer_id", "amount",
+                 "currency", "payment_date", "status", "payment_method"],
+    ).filter(pl.col("transaction_id").is_not_null())
+
+    orders = reviews.join(transactions, on="transaction_id", how="inner")
+    orders = orders.filter(pl.col("customer_id").is_not_null())
+
+    customer_lookup = (
+        customers_lf.select(["customer_id", "email"])
+        .rename({"email": "customer_email"})
+        .unique(subset=["customer_id"], keep="first")
+    )
+    orders = orders.join(customer_lookup, on="customer_id", how="inner")
+
+    orders = orders.with_columns(
+        pl.col("amount").str.replace_all(r"[$,]", "").cast(pl.Float64, strict=False)
+    )
+    orders = orders.filter(pl.col("amount").is_not_null() & (pl.col("amount") > 0))
+
+    orders = orders.rename({"payment_date": "order_date"})
+    orders = orders.with_columns(
+        pl.col("order_date").str.to_datetime(strict=False),
+        pl.col("review_date").str.to_datetime(strict=False),
+    )
+    orders = orders.unique(subset=["order_id"], keep="first", maintain_order=True)
+    return _clean_text_columns(orders)
+
+
+def validate_quality_lazy(customers_lf, orders_lf):
+    """Contagens de qualidade como planos lazy (um select agregado cada)."""
+    customers_stats = customers_lf.select(
+        pl.len().alias("total"),
+        pl.col("customer_id").n_unique().alias("unique_ids"),
+        pl.col("email").n_unique().alias("unique_emails"),
+    )
+    orders_stats = orders_lf.select(
+        pl.len().alias("total"),
+        pl.col("order_id").n_unique().alias("unique_ids"),
+        pl.col("customer_email").n_unique().alias("customers_with_orders"),
+        pl.col("order_date").is_null().sum().alias("null_order_dates"),
+    )
+    return customers_stats, orders_stats
+
+
+def transform_all_lazy():
+    """Roda a Silver inteira como planos lazy com sink em streaming.
+
+    sink_parquet materializa o resultado em streaming, sem nunca montar o
+    frame completo em memoria; o otimizador do Polars funde filtros e
+    projecoes de cada plano numa unica passada sobre a Bronze.
+    """
+    logger.info("Iniciando transformacao da camada Silver (polars lazy)")
+    SILVER_DIR.mkdir(parents=True, exist_ok=True)
+
+    customers_lf = transform_customers_lazy()
+    orders_lf = transform_orders_lazy(customers_lf)
+    customers_stats, orders_stats = validate_quality_lazy(customers_lf, orders_lf)
+
+    # os dois sinks e as duas agregacoes de qualidade sao declarados lazy
+    # e submetidos juntos: collect_all agenda tudo no thread pool do
+    # Polars com cache dos subplanos comuns (o plano de customers e
+    # compartilhado pelos quatro), em vez de quatro execucoes sequenciais
+    # re-lendo a Bronze
+    results = pl.collect_all(
+        [
+            customers_lf.sink_parquet(
+                SILVER_DIR / "customers.parquet", compression="zstd", lazy=True
+            ),
+            orders_lf.sink_parquet(
+                SILVER_DIR / "orders.parquet", compression="zstd", lazy=True
+            ),
+            customers_stats,
+            orders_stats,
+        ]
+    )
+    customers_row = results[2].row(0, named=True)
+    orders_row = results[3].row(0, named=True)
+
+    if orders_row["null_order_dates"] > 0:
+        logger.error("CRITICO: %d orders com order_date NULL", orders_row["null_order_dates"])
+    logger.info(
+        "Qualidade customers: %d registros, %d ids unicos, %d emails unicos",
+        customers_row["total"], customers_row["unique_ids"], customers_row["unique_emails"],
+    )
+    logger.info(
+        "Qualidade orders: %d registros, %d ids unicos, %d clientes com pedidos",
+        orders_row["total"], orders_row["unique_ids"], orders_row["customers_with_orders"],
+    )
+    logger.info("Camada Silver (polars) concluida")
+    return customers_row, orders_row
+
+
+if __name__ == "__main__":
+    transform_all_lazy()
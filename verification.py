@@ -0,0 +1,223 @@
+"""
+Script de verificacao dos arquivos JSON brutos de data/raw.
+
+Para cada arquivo, mostra os campos do primeiro registro, a contagem de
+registros e quais campos parecem referenciar clientes - apoio para mapear
+os relacionamentos entre as fontes antes da carga Bronze.
+"""
+
+import io
+import mmap
+import os
+import pickle
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import ijson
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+RAW_DIR = BASE_DIR / "data" / "raw"
+
+# cache em disco do cabecalho parseado (campos + contagem), chaveado por
+# mtime+tamanho: no loop tipico de debug os arquivos nao mudam entre as
+# execucoes e o re-parse inteiro vira um hit de dicionario
+CACHE_PATH = BASE_DIR / ".cache" / "verification.pkl"
+
+# palavras-chave que indicam relacao com cliente nos nomes de campo
+CUSTOMER_KEYWORDS = ["customer", "email", "user", "client"]
+
+# sufixos de shard mensal/trimestral nos nomes de arquivo: shards do
+# mesmo dataset (customer_reviews_jan/_feb etc.) compartilham schema
+_SHARD_SUFFIX = re.compile(r"_(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|q[1-4])$")
+
+
+def _schema_prefix(stem):
+    """Nome do dataset sem o sufixo de shard (_jan, _feb, _q1...)."""
+    return _SHARD_SUFFIX.sub("", stem)
+
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {}
+
+
+def _save_cache(cache):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_PATH, "wb") as f:
+        pickle.dump(cache, f)
+
+
+def read_json_header(filepath):
+    """Le campos do primeiro registro e contagem de um JSON em streaming.
+
+    Uma unica passada do ijson: o primeiro registro e materializado para
+    expor os campos e o mesmo iterador segue contando o restante - nada
+    do grafo de objetos completo fica em memoria nem o arquivo e lido
+    duas vezes, ao contrario de um json.load que alocaria o arquivo
+    inteiro so para ler data[0].keys() e len(data).
+    Devolve (fields, record_count); fields e None para arquivo vazio.
+    """
+    # mmap evita a copia do read() para userspace: o parser consome as
+    # paginas direto do page cache, sem buffer intermediario
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            items = ijson.items(mm, "item")
+            first = next(items, None)
+            if first is None:
+                return None, 0
+            fields = list(first.keys())
+            record_count = 1 + sum(1 for _ in items)
+
+    return fields, record_count
+
+
+def count_records(filepath):
+    """Conta os registros do array sem materializar nenhum valor.
+
+    Percorre so os eventos do ijson (start_map de cada item de topo):
+    nenhum dict ou string de valor e construido - usado nos shards cujo
+    schema ja veio do par _jan/_feb correspondente.
+    """
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return sum(
+                1
+                for prefix, event, _ in ijson.parse(mm)
+                if prefix == "item" and event == "start_map"
+            )
+
+
+def format_report(filename, fields, record_count):
+    """Formata o relatorio de um arquivo como string unica.
+
+    Devolver a string (em vez de imprimir) mantem o stdout coerente com
+    os cabecalhos sendo parseados em workers paralelos.
+    """
+    lines = [f"\n{'=' * 60}", f"Arquivo: {filename}"]
+    if fields is None:
+        lines.append("  (arquivo vazio)")
+        return "\n".join(lines)
+
+    # classificacao vetorizada dos nomes de coluna: um np.char.find em C
+    # por palavra-chave sobre o array inteiro, em vez de lower() +
+    # substring por campo no interpretador
+    cols = np.array(fields)
+    lowered = np.char.lower(cols)
+    matched = np.zeros(len(cols), dtype=bool)
+    for keyword in CUSTOMER_KEYWORDS:
+        matched |= np.char.find(lowered, keyword) >= 0
+    customer_fields = cols[matched].tolist()
+
+    lines.append(f"  Registros: {record_count}")
+    lines.append(f"  Campos: {fields}")
+    if customer_fields:
+        lines.append(f"  Campos relacionados a cliente: {customer_fields}")
+    else:
+        lines.append("  Sem campos relacionados a cliente")
+    return "\n".join(lines)
+
+
+def inspect_json_for_customer_relation(filepath):
+    """Inspeciona um unico arquivo e devolve o relatorio formatado."""
+    filepath = Path(filepath)
+    fields, record_count = read_json_header(filepath)
+    return format_report(filepath.name, fields, record_count)
+
+
+def main():
+    # um unico os.scandir lista o diretorio e ja devolve mtime/tamanho de
+    # cada entrada (DirEntry.stat cacheado), em vez de um stat por arquivo
+    try:
+        entries = sorted(
+            (e for e in os.scandir(RAW_DIR) if e.name.endswith(".json")),
+            key=lambda e: e.name,
+        )
+    except FileNotFoundError:
+        entries = []
+    if not entries:
+        print(f"Nenhum arquivo JSON encontrado em {RAW_DIR}")
+        return
+    json_files = [Path(e.path) for e in entries]
+
+    # saida acumulada num StringIO e escrita de uma vez: um write no
+    # stdout para a execucao inteira, em vez de um flush da linha-buffer
+    # por print
+    out = io.StringIO()
+    out.write(f"Verificando {len(json_files)} arquivos em {RAW_DIR}\n")
+
+    # hits saem do cache sem tocar no arquivo; so os modificados (ou
+    # novos) vao para o pool de parse
+    cache = _load_cache()
+    headers = {}
+    to_parse = []
+    for json_file, dir_entry in zip(json_files, entries):
+        stat = dir_entry.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = cache.get(str(json_file))
+        if cached is not None and cached[0] == key:
+            headers[json_file] = cached[1]
+        else:
+            to_parse.append((json_file, key))
+
+    if to_parse:
+        # shards do mesmo dataset compartilham schema: so o primeiro de
+        # cada prefixo paga o parse do cabecalho; os demais apenas contam
+        # registros, sem materializar valor nenhum
+        known_fields = {}
+        for json_file, (fields, _) in headers.items():
+            if fields is not None:
+                known_fields.setdefault(_schema_prefix(json_file.stem), fields)
+        full_parse, count_only = [], []
+        for json_file, key in to_parse:
+            prefix = _schema_prefix(json_file.stem)
+            if prefix in known_fields or any(
+                _schema_prefix(f.stem) == prefix for f, _ in full_parse
+            ):
+                count_only.append((json_file, key, prefix))
+            else:
+                full_parse.append((json_file, key))
+
+        # cada parse e independente e dominado pelo parser: distribuir os
+        # arquivos entre processos escala quase linear ate min(arquivos,
+        # cores)
+        max_workers = min(len(to_parse), os.cpu_count())
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed = executor.map(read_json_header, [f for f, _ in full_parse])
+            counted = executor.map(count_records, [f for f, _, _ in count_only])
+            for (json_file, key), header in zip(full_parse, parsed):
+                headers[json_file] = header
+                cache[str(json_file)] = (key, header)
+                if header[0] is not None:
+                    known_fields.setdefault(_schema_prefix(json_file.stem), header[0])
+            for (json_file, key, prefix), n_records in zip(count_only, counted):
+                fields = known_fields.get(prefix) if n_records > 0 else None
+                if n_records > 0 and fields is None:
+                    # o shard que pagou o parse do prefixo estava vazio e
+                    # nao rendeu schema; este arquivo tem registros, entao
+                    # paga o parse completo do cabecalho
+                    fields, n_records = read_json_header(json_file)
+                    if fields is not None:
+                        known_fields.setdefault(prefix, fields)
+                headers[json_file] = (fields, n_records)
+                cache[str(json_file)] = (key, (fields, n_records))
+        _save_cache(cache)
+
+    for json_file in json_files:
+        fields, record_count = headers[json_file]
+        out.write(format_report(json_file.name, fields, record_count))
+        out.write("\n")
+    sys.stdout.write(out.getvalue())
+
+
+if __name__ == "__main__":
+    main()